@@ -5,12 +5,25 @@ Configuration settings and constants.
 from .settings import (
     GROQ_API_KEY,
     GROQ_API_URL,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    LATENCY_TARGET,
+    MAX_CONCURRENCY,
     MAX_TOPIC_LENGTH,
+    MIN_CONCURRENCY,
     MIN_TOPIC_LENGTH,
     MODEL,
+    RATE_LIMIT_MAX_TRACKED_IPS,
     RATE_LIMIT_REQUESTS,
+    RATE_LIMIT_SWEEP_BATCH,
     RATE_LIMIT_WINDOW,
+    REDIS_URL,
     REQUEST_TIMEOUT,
+    RESULT_CACHE_SIZE,
+    RESULT_CACHE_TTL,
+    STATIC_CACHE_MAX_AGE,
+    TEMPLATES_AUTO_RELOAD,
+    TRUSTED_PROXIES,
 )
 
 __all__ = [
@@ -18,8 +31,21 @@ __all__ = [
     "GROQ_API_URL", 
     "MODEL",
     "REQUEST_TIMEOUT",
+    "HTTP_MAX_CONNECTIONS",
+    "HTTP_MAX_KEEPALIVE_CONNECTIONS",
+    "MAX_CONCURRENCY",
+    "MIN_CONCURRENCY",
+    "LATENCY_TARGET",
+    "RESULT_CACHE_SIZE",
+    "RESULT_CACHE_TTL",
+    "STATIC_CACHE_MAX_AGE",
+    "TEMPLATES_AUTO_RELOAD",
     "MIN_TOPIC_LENGTH",
     "MAX_TOPIC_LENGTH",
     "RATE_LIMIT_REQUESTS",
     "RATE_LIMIT_WINDOW",
+    "RATE_LIMIT_MAX_TRACKED_IPS",
+    "RATE_LIMIT_SWEEP_BATCH",
+    "REDIS_URL",
+    "TRUSTED_PROXIES",
 ]
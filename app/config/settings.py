@@ -18,6 +18,28 @@ GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 MODEL = "llama-3.3-70b-versatile"  # Use a known working Groq model
 REQUEST_TIMEOUT = 30.0
 
+# HTTP Connection Pool Configuration
+HTTP_MAX_CONNECTIONS: int = 200  # concurrent connections to the Groq API
+HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 100  # idle connections kept for reuse
+
+# Adaptive Concurrency Configuration; the limit on in-flight Groq API calls
+# shrinks on upstream 429s, 5xx errors, timeouts or slow responses and
+# grows back while the API is healthy. Calls over the limit queue.
+MAX_CONCURRENCY: int = 50  # upper bound, also the starting limit
+MIN_CONCURRENCY: int = 1  # lower bound
+LATENCY_TARGET: float = 5.0  # seconds; slower mean latency counts as overload
+
+# Result Cache Configuration; generated posts are reused for repeat requests
+RESULT_CACHE_SIZE: int = 1024  # posts kept; least recently used are evicted
+RESULT_CACHE_TTL: float = 3600.0  # seconds before a cached post is regenerated
+
+# Static Files Configuration
+STATIC_CACHE_MAX_AGE: int = 86400  # seconds browsers may reuse static assets
+
+# Re-check templates for changes on every render (useful while editing them);
+# off by default so compiled templates are reused without a stat per render
+TEMPLATES_AUTO_RELOAD = os.getenv("TEMPLATES_AUTO_RELOAD", "false").lower() == "true"
+
 # Validation Constants
 MAX_TOPIC_LENGTH = 1000
 MIN_TOPIC_LENGTH = 3
@@ -25,3 +47,17 @@ MIN_TOPIC_LENGTH = 3
 # Rate Limiting Configuration
 RATE_LIMIT_REQUESTS: int = 10  # requests per window
 RATE_LIMIT_WINDOW: int = 60  # seconds
+RATE_LIMIT_MAX_TRACKED_IPS: int = 100_000  # least recently seen IPs are evicted
+RATE_LIMIT_SWEEP_BATCH: int = 50  # idle buckets checked for eviction per request
+
+# Reverse proxies (IPs or CIDR ranges, comma-separated) whose X-Forwarded-For
+# header is trusted; from any other peer the header is ignored
+TRUSTED_PROXIES = [
+    proxy.strip()
+    for proxy in os.getenv("TRUSTED_PROXIES", "").split(",")
+    if proxy.strip()
+]
+
+# Optional Redis store shared by all workers (e.g. redis://localhost:6379/0);
+# without it each worker enforces the limit separately
+REDIS_URL = os.getenv("REDIS_URL")
@@ -5,19 +5,45 @@ This module contains the main FastAPI application with route handlers
 for both web interface and API endpoints.
 """
 
+import asyncio
 import logging
 import time
-
-from fastapi import FastAPI, HTTPException, Request, status
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import (
+    Depends,
+    FastAPI,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.utils import validation_error_definition
+from fastapi.responses import (
+    HTMLResponse,
+    ORJSONResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.templating import Jinja2Templates
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
+from pydantic import ValidationError
 
 from .config.settings import (
     MAX_TOPIC_LENGTH,
     MIN_TOPIC_LENGTH,
     RATE_LIMIT_REQUESTS,
     RATE_LIMIT_WINDOW,
+    TEMPLATES_AUTO_RELOAD,
 )
 from .models import (
     ErrorResponse,
@@ -25,13 +51,63 @@ from .models import (
     PostGenerationRequest,
     PostGenerationResponse,
 )
-from .services import generate_social_post
-from .utils import check_rate_limit, get_client_ip
+from .services import (
+    close_client,
+    generate_post_from_sanitized,
+    get_client,
+    sanitize_topic,
+    stream_post_from_sanitized,
+    warm_up_client,
+)
+from .utils import (
+    CachedStaticFiles,
+    check_rate_limit,
+    close_rate_limiter,
+    get_client_ip,
+    init_rate_limiter,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(name=__name__)
 
+# Human-readable platform names used in logs and templates
+PLATFORM_DISPLAY_NAMES = {
+    Platform.TWITTER: "X (Twitter)",
+    Platform.LINKEDIN: "LinkedIn",
+}
+
+# Form validation error messages (settings are constant, so build them once)
+_ERR_EMPTY = "Please provide a topic"
+_ERR_TOO_SHORT = f"Topic must be at least {MIN_TOPIC_LENGTH} characters long"
+_ERR_TOO_LONG = f"Topic must be no more than {MAX_TOPIC_LENGTH} characters long"
+
+# Form error messages by pydantic error type; value errors raised by the
+# request model's validators carry their own message
+_FORM_ERRORS = {
+    "string_too_short": _ERR_TOO_SHORT,
+    "string_too_long": _ERR_TOO_LONG,
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Manage application startup and shutdown.
+
+    Opens the shared Groq HTTP client on startup, pre-warming a connection in
+    the background, and sets up the rate limiter's Redis client when
+    REDIS_URL is configured. Closes their pooled connections on shutdown.
+    """
+    await init_rate_limiter()
+    await get_client()
+    warm_up = asyncio.create_task(warm_up_client())
+    yield
+    warm_up.cancel()
+    await close_client()
+    await close_rate_limiter()
+
+
 # FastAPI App Configuration
 app = FastAPI(
     title="Social Media Post Generator",
@@ -39,26 +115,107 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
+
+# Compiled templates are cached on disk so every worker and restart can skip
+# recompiling them, and in memory without re-checking the source files
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader("templates"),
+        bytecode_cache=FileSystemBytecodeCache(),
+        auto_reload=TEMPLATES_AUTO_RELOAD,
+        autoescape=select_autoescape(["html"]),
+    )
+)
 
 
 # Log current settings on startup
-logger.info(f"Application starting with MAX_TOPIC_LENGTH: {MAX_TOPIC_LENGTH}")
-logger.info(f"Application starting with MIN_TOPIC_LENGTH: {MIN_TOPIC_LENGTH}")
+logger.info("Application starting with MAX_TOPIC_LENGTH: %d", MAX_TOPIC_LENGTH)
+logger.info("Application starting with MIN_TOPIC_LENGTH: %d", MIN_TOPIC_LENGTH)
+
+
+# Settings never change after startup, so the debug payload is built once
+_DEBUG_SETTINGS_PAYLOAD = {
+    "MAX_TOPIC_LENGTH": MAX_TOPIC_LENGTH,
+    "MIN_TOPIC_LENGTH": MIN_TOPIC_LENGTH,
+    "message": "Current validation settings",
+}
 
 
 # Debug endpoint to check current settings
 @app.get("/debug/settings", tags=["Debug"])
 async def debug_settings():
     """Debug endpoint to check current validation settings"""
-    return {
-        "MAX_TOPIC_LENGTH": MAX_TOPIC_LENGTH,
-        "MIN_TOPIC_LENGTH": MIN_TOPIC_LENGTH,
-        "message": "Current validation settings",
-    }
+    return _DEBUG_SETTINGS_PAYLOAD
+
+
+def json_response(model: PostGenerationResponse) -> Response:
+    """
+    Serialize an already-validated response model straight to JSON.
+
+    Skips FastAPI's response_model re-validation pass, since the model was
+    validated when it was constructed.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+# OpenAPI schema for the JSON body parsed by parse_post_generation_request;
+# nested models ($defs) resolve to the shared component schemas
+_POST_REQUEST_SCHEMA = PostGenerationRequest.model_json_schema(
+    ref_template="#/components/schemas/{model}"
+)
+_POST_REQUEST_SCHEMA.pop("$defs", None)
+
+# FastAPI only documents its 422 response for routes with declared body
+# parameters, so describe it explicitly
+_VALIDATION_ERROR_SCHEMA = {
+    "title": "HTTPValidationError",
+    "type": "object",
+    "properties": {
+        "detail": {
+            "title": "Detail",
+            "type": "array",
+            "items": validation_error_definition,
+        }
+    },
+}
+
+# Request body and 422 response shared by the post generation API routes
+_GENERATE_POST_OPENAPI_EXTRA = {
+    "requestBody": {
+        "content": {"application/json": {"schema": _POST_REQUEST_SCHEMA}},
+        "required": True,
+    },
+    "responses": {
+        "422": {
+            "description": "Validation Error",
+            "content": {"application/json": {"schema": _VALIDATION_ERROR_SCHEMA}},
+        }
+    },
+}
+
+
+async def parse_post_generation_request(request: Request) -> PostGenerationRequest:
+    """
+    Parse and validate the JSON request body in a single pydantic-core pass.
+
+    Uses model_validate_json on the raw body instead of decoding it with the
+    stdlib json module and then validating the resulting dict.
+    """
+    try:
+        return PostGenerationRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Report errors under "body" like FastAPI's own body validation
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ]
+        )
 
 
 # Route Handlers
@@ -78,55 +235,56 @@ async def generate_post_page(request: Request):
     return templates.TemplateResponse("generate_post.html", {"request": request})
 
 
+def form_error_message(error: ValidationError) -> str:
+    """Turn a PostGenerationRequest validation error into a form error message."""
+    detail = error.errors(include_url=False)[0]
+    if not detail["input"]:
+        return _ERR_EMPTY
+    if detail["type"] == "value_error":
+        return str(detail["ctx"]["error"])
+    return _FORM_ERRORS.get(detail["type"], detail["msg"])
+
+
 @app.post("/generate-post", response_class=HTMLResponse, tags=["Web Interface"])
-async def generate_post_form(request: Request):
+async def generate_post_form(
+    request: Request, topic: str = Form(""), platform: str = Form("twitter")
+):
     """
     Handle form submission for post generation (HTML response).
     """
     try:
-        form_data = await request.form()
-        topic = str(form_data.get("topic", "")).strip()
-        platform_str = str(form_data.get("platform", "twitter")).strip()
+        topic = topic.strip()
 
         # Convert platform string to enum
         try:
-            platform = Platform(platform_str)
+            platform = Platform(platform.strip())
         except ValueError:
             platform = Platform.TWITTER  # Default fallback
 
-        if not topic:
-            return templates.TemplateResponse(
-                "generate_post.html",
-                {"request": request, "error": "Please provide a topic"},
-            )
-
-        # Validate topic length
-        if len(topic) < MIN_TOPIC_LENGTH:
-            return templates.TemplateResponse(
-                "generate_post.html",
-                {
-                    "request": request,
-                    "error": f"Topic must be at least {MIN_TOPIC_LENGTH} characters long",
-                },
-            )
-
-        if len(topic) > MAX_TOPIC_LENGTH:
+        # Validate with the same model as the JSON API
+        try:
+            topic = PostGenerationRequest.model_validate(
+                {"topic": topic, "platform": platform}
+            ).topic
+        except ValidationError as e:
             return templates.TemplateResponse(
                 "generate_post.html",
-                {
-                    "request": request,
-                    "error": f"Topic must be no more than {MAX_TOPIC_LENGTH} characters long",
-                },
+                {"request": request, "error": form_error_message(e)},
             )
 
         # Generate post
-        start_time = time.time()
-        generated_post = await generate_social_post(topic, platform)
-        processing_time = time.time() - start_time
+        start_time = time.perf_counter()
+        generated_post = await generate_post_from_sanitized(
+            sanitize_topic(topic), platform
+        )
+        processing_time = time.perf_counter() - start_time
 
-        platform_name = "X (Twitter)" if platform == Platform.TWITTER else "LinkedIn"
+        platform_name = PLATFORM_DISPLAY_NAMES[platform]
         logger.info(
-            f"Generated {platform_name} post for topic: {topic[:50]}... (took {processing_time:.2f}s)"
+            "Generated %s post for topic: %s... (took %.2fs)",
+            platform_name,
+            topic[:50],
+            processing_time,
         )
 
         return templates.TemplateResponse(
@@ -142,7 +300,7 @@ async def generate_post_form(request: Request):
         )
 
     except Exception as e:
-        logger.error(f"Error in form submission: {str(e)}")
+        logger.error("Error in form submission: %s", e)
         return templates.TemplateResponse(
             "generate_post.html",
             {
@@ -159,11 +317,33 @@ async def health_check():
     return {"status": "healthy", "timestamp": time.time()}
 
 
+async def enforce_rate_limit(client_ip: str) -> None:
+    """
+    Reject the request if the client has exceeded the rate limit.
+
+    Raises:
+        HTTPException: 429 if the rate limit is exceeded
+    """
+    if not await check_rate_limit(client_ip):
+        logger.warning("Rate limit exceeded for IP: %s", client_ip)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded. Maximum {RATE_LIMIT_REQUESTS} requests per {RATE_LIMIT_WINDOW} seconds.",
+        )
+
+
+def sse_event(data: object, event: str | None = None) -> bytes:
+    """Encode one server-sent event with a JSON data payload."""
+    payload = b"data: " + orjson.dumps(data) + b"\n\n"
+    return f"event: {event}\n".encode() + payload if event else payload
+
+
 # API Endpoints
 @app.post(
     "/api/generate-post",
-    response_model=PostGenerationResponse,
+    response_model=None,
     responses={
+        200: {"model": PostGenerationResponse, "description": "Successful Response"},
         400: {"model": ErrorResponse, "description": "Invalid input"},
         429: {"model": ErrorResponse, "description": "Rate limit exceeded"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
@@ -171,69 +351,151 @@ async def health_check():
     tags=["API"],
     summary="Generate Social Media Post",
     description="Generate an engaging social media post based on the provided topic using AI.",
+    openapi_extra=_GENERATE_POST_OPENAPI_EXTRA,
 )
 async def api_generate_post(
-    request_data: PostGenerationRequest, request: Request
-) -> PostGenerationResponse:
+    request: Request,
+    request_data: PostGenerationRequest = Depends(parse_post_generation_request),
+    nocache: bool = Query(
+        False, description="Generate a fresh post instead of reusing a cached one"
+    ),
+) -> Response:
     """
     Generate a social media post via API endpoint.
 
     - **topic**: The topic or idea for the social media post (3-1000 characters)
     - **platform**: The target social media platform (twitter or linkedin, defaults to twitter)
+    - **nocache**: Skip the cache of recently generated posts (query parameter)
 
     Returns a JSON response with the generated post or error information.
     """
     # Debug logging for incoming request
     client_ip = get_client_ip(request)
-    logger.info(f"API request received from IP: {client_ip}")
+    logger.info("API request received from IP: %s", client_ip)
     logger.info(
-        f"Request data - Topic length: {len(request_data.topic)}, Platform: {request_data.platform}"
-    )
-    logger.debug(
-        f"Topic content: {request_data.topic[:100]}{'...' if len(request_data.topic) > 100 else ''}"
+        "Request data - Topic length: %d, Platform: %s",
+        len(request_data.topic),
+        request_data.platform,
     )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Topic content: %s%s",
+            request_data.topic[:100],
+            "..." if len(request_data.topic) > 100 else "",
+        )
 
     # Rate limiting check
-    if not check_rate_limit(client_ip):
-        logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Rate limit exceeded. Maximum {RATE_LIMIT_REQUESTS} requests per {RATE_LIMIT_WINDOW} seconds.",
-        )
+    await enforce_rate_limit(client_ip)
 
-    start_time = time.time()
+    start_time = time.perf_counter()
+    generated_post = None
+    error_message = None
     try:
-        platform_name = (
-            "X (Twitter)" if request_data.platform == Platform.TWITTER else "LinkedIn"
-        )
+        platform_name = PLATFORM_DISPLAY_NAMES[request_data.platform]
         logger.info(
-            f"API request for {platform_name} post on topic: {request_data.topic[:50]}... from IP: {client_ip}"
+            "API request for %s post on topic: %s... from IP: %s",
+            platform_name,
+            request_data.topic[:50],
+            client_ip,
         )
 
-        generated_post = await generate_social_post(
-            request_data.topic, request_data.platform
+        # The request model has already stripped and validated the topic
+        generated_post = await generate_post_from_sanitized(
+            sanitize_topic(request_data.topic),
+            request_data.platform,
+            use_cache=not nocache,
         )
-        processing_time = time.time() - start_time
+    except ValueError as e:
+        logger.warning("Validation error: %s", e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error("Error generating post: %s", e)
+        error_message = str(e)
 
-        logger.info(f"API generation completed in {processing_time:.2f}s")
+    # Timed once for both the success and the error response
+    processing_time = time.perf_counter() - start_time
+    if error_message is None:
+        logger.info("API generation completed in %.2fs", processing_time)
 
-        return PostGenerationResponse(
-            success=True,
+    return json_response(
+        PostGenerationResponse(
+            success=error_message is None,
             generated_post=generated_post,
-            error_message=None,
+            error_message=error_message,
             processing_time=processing_time,
             platform=request_data.platform,
         )
+    )
 
-    except ValueError as e:
-        logger.warning(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error generating post: {str(e)}")
-        return PostGenerationResponse(
-            success=False,
-            generated_post=None,
-            error_message=str(e),
-            processing_time=time.time() - start_time,
-            platform=request_data.platform,
+
+@app.post(
+    "/api/generate-post/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"text/event-stream": {}},
+            "description": "Server-sent events: one `data` event per chunk of "
+            "post text (a JSON string), then a `done` event with the processing "
+            "time and platform, or an `error` event with an error message",
+        },
+        429: {"model": ErrorResponse, "description": "Rate limit exceeded"},
+    },
+    tags=["API"],
+    summary="Stream Social Media Post",
+    description="Generate a social media post, streaming the text as it is generated.",
+    openapi_extra=_GENERATE_POST_OPENAPI_EXTRA,
+)
+async def api_generate_post_stream(
+    request: Request,
+    request_data: PostGenerationRequest = Depends(parse_post_generation_request),
+    nocache: bool = Query(
+        False, description="Generate a fresh post instead of reusing a cached one"
+    ),
+) -> StreamingResponse:
+    """
+    Generate a social media post, streamed as server-sent events.
+
+    - **topic**: The topic or idea for the social media post (3-1000 characters)
+    - **platform**: The target social media platform (twitter or linkedin, defaults to twitter)
+    - **nocache**: Skip the cache of recently generated posts (query parameter)
+
+    The first words reach the client as soon as Groq produces them instead of
+    after the whole post has been generated. A recently generated post is sent
+    as a single chunk.
+    """
+    client_ip = get_client_ip(request)
+    logger.info(
+        "API stream request from IP: %s, Topic length: %d, Platform: %s",
+        client_ip,
+        len(request_data.topic),
+        request_data.platform,
+    )
+    await enforce_rate_limit(client_ip)
+
+    async def events() -> AsyncIterator[bytes]:
+        start_time = time.perf_counter()
+        try:
+            # The request model has already stripped and validated the topic
+            async for chunk in stream_post_from_sanitized(
+                sanitize_topic(request_data.topic),
+                request_data.platform,
+                use_cache=not nocache,
+            ):
+                yield sse_event(chunk)
+        except Exception as e:
+            logger.error("Error streaming post: %s", e)
+            yield sse_event({"error_message": str(e)}, event="error")
+            return
+
+        processing_time = time.perf_counter() - start_time
+        logger.info("API stream completed in %.2fs", processing_time)
+        yield sse_event(
+            {"processing_time": processing_time, "platform": request_data.platform},
+            event="done",
         )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
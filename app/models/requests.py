@@ -2,17 +2,16 @@
 Request models and enums for the API.
 """
 
-import importlib
+import re
 from enum import Enum
 
 from pydantic import BaseModel, Field, field_validator
 
-# Force reload settings to pick up any changes
-from ..config import settings
+from ..config.settings import MAX_TOPIC_LENGTH, MIN_TOPIC_LENGTH
 
-importlib.reload(settings)
-
-from ..config.settings import MAX_TOPIC_LENGTH, MIN_TOPIC_LENGTH  # noqa: E402
+# Basic content filtering, compiled once into a single case-insensitive scan
+FORBIDDEN_WORDS = ("spam", "scam", "hack", "illegal")
+_FORBIDDEN_RE = re.compile("|".join(map(re.escape, FORBIDDEN_WORDS)), re.IGNORECASE)
 
 
 class Platform(str, Enum):
@@ -41,12 +40,12 @@ class PostGenerationRequest(BaseModel):
     @classmethod
     def validate_topic(cls, v):
         """Validate and sanitize topic input"""
-        if not v or not v.strip():
+        topic = v.strip()
+        if not topic:
             raise ValueError("Topic cannot be empty")
 
         # Basic content filtering
-        forbidden_words = ["spam", "scam", "hack", "illegal"]
-        if any(word in v.lower() for word in forbidden_words):
+        if _FORBIDDEN_RE.search(topic):
             raise ValueError("Topic contains inappropriate content")
 
-        return v.strip()
+        return topic
@@ -2,9 +2,24 @@
 Business logic services for the application.
 """
 
-from .post_generator import generate_social_post, get_platform_prompt
+from .post_generator import (
+    close_client,
+    generate_post_from_sanitized,
+    generate_social_post,
+    get_client,
+    get_platform_prompt,
+    sanitize_topic,
+    stream_post_from_sanitized,
+    warm_up_client,
+)
 
 __all__ = [
+    "close_client",
+    "generate_post_from_sanitized",
     "generate_social_post",
+    "get_client",
     "get_platform_prompt",
+    "sanitize_topic",
+    "stream_post_from_sanitized",
+    "warm_up_client",
 ]
@@ -2,15 +2,181 @@
 Social media post generation service using Groq API.
 """
 
+import asyncio
+import hashlib
 import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from functools import lru_cache, partial
 
 import httpx
-
-from ..config.settings import GROQ_API_KEY, GROQ_API_URL, MODEL, REQUEST_TIMEOUT
+import orjson
+
+from ..config.settings import (
+    GROQ_API_KEY,
+    GROQ_API_URL,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    LATENCY_TARGET,
+    MAX_CONCURRENCY,
+    MIN_CONCURRENCY,
+    MODEL,
+    REQUEST_TIMEOUT,
+    RESULT_CACHE_SIZE,
+    RESULT_CACHE_TTL,
+)
 from ..models.requests import Platform
+from ..utils.concurrency import AdaptiveConcurrencyLimiter
 
 logger = logging.getLogger(__name__)
 
+# Request headers; the API key is fixed for the life of the process
+_HEADERS = {
+    "Authorization": f"Bearer {GROQ_API_KEY}",
+    "Content-Type": "application/json",
+}
+
+# Request bodies, JSON-encoded once at import time and split around the
+# prompt, so each call only has to encode the prompt string itself
+_PROMPT_PLACEHOLDER = "__PROMPT__"
+_PAYLOAD = {
+    "model": MODEL,
+    "messages": [{"role": "user", "content": _PROMPT_PLACEHOLDER}],
+    "max_tokens": 300,
+    "temperature": 0.7,
+}
+_PAYLOAD_PREFIX, _PAYLOAD_SUFFIX = orjson.dumps(_PAYLOAD).split(
+    orjson.dumps(_PROMPT_PLACEHOLDER)
+)
+_STREAM_PAYLOAD_PREFIX, _STREAM_PAYLOAD_SUFFIX = orjson.dumps(
+    {**_PAYLOAD, "stream": True}
+).split(orjson.dumps(_PROMPT_PLACEHOLDER))
+
+# Characters of an error response body kept in logs and error messages
+_ERROR_BODY_LIMIT = 512
+
+# Server-sent event lines carrying a streamed completion chunk
+_SSE_DATA_PREFIX = "data: "
+_SSE_DONE = "[DONE]"
+
+# Shared HTTP client, reused across requests so connections to the Groq API
+# are kept alive instead of re-doing DNS, TCP and TLS setup on every call.
+# HTTP/2 multiplexes concurrent requests over a single connection.
+_client: httpx.AsyncClient | None = None
+
+# Bounds concurrent Groq API calls so a burst queues here instead of
+# overrunning the connection pool and the upstream rate limit all at once;
+# the bound backs off while Groq signals overload
+_limiter = AdaptiveConcurrencyLimiter(
+    MAX_CONCURRENCY, minimum=MIN_CONCURRENCY, latency_target=LATENCY_TARGET
+)
+
+# Remaining share of Groq's per-minute token budget below which new calls
+# wait for the budget to reset
+_TOKEN_HEADROOM = 0.1
+
+# Units of Groq's rate limit reset durations, e.g. "7.66s" or "1m2.5s"
+_DURATION_RE = re.compile(r"([\d.]+)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+async def get_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client, creating it on first use.
+
+    Returns:
+        The process-wide httpx.AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _client
+
+
+async def warm_up_client() -> None:
+    """
+    Open a connection to the Groq API ahead of the first real request.
+
+    Sends a cheap HEAD request so the TCP/TLS/HTTP/2 setup happens at startup
+    and the connection is left in the keep-alive pool. The response status is
+    irrelevant; failures are logged and otherwise ignored.
+    """
+    client = await get_client()
+    try:
+        response = await client.head(GROQ_API_URL)
+        logger.info(
+            "Warmed up Groq API connection (%s, %s)",
+            response.http_version,
+            response.status_code,
+        )
+    except httpx.HTTPError as e:
+        logger.warning("Could not warm up Groq API connection: %s", e)
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# In-flight API calls keyed by (platform, sanitized topic), so concurrent
+# identical requests share a single upstream call instead of fanning out
+_inflight: dict[tuple[Platform, str], asyncio.Task[str]] = {}
+
+
+# Recently generated posts keyed by _result_key, in least-recently-used order,
+# each with the time.monotonic() value it expires at
+_results: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+
+
+def _result_key(platform: Platform, sanitized_topic: str) -> bytes:
+    """Hash a (platform, topic) pair into a compact, fixed-size cache key."""
+    return hashlib.blake2b(
+        f"{platform.value}\0{sanitized_topic}".encode(), digest_size=16
+    ).digest()
+
+
+def _get_cached_post(key: bytes) -> str | None:
+    """Get an unexpired cached post, marking it as recently used."""
+    entry = _results.get(key)
+    if entry is None:
+        return None
+    post, expires_at = entry
+    if expires_at <= time.monotonic():
+        del _results[key]
+        return None
+    _results.move_to_end(key)
+    return post
+
+
+def _cache_post(key: bytes, post: str) -> None:
+    """Cache a generated post, evicting the least recently used when full."""
+    _results[key] = (post, time.monotonic() + RESULT_CACHE_TTL)
+    _results.move_to_end(key)
+    if len(_results) > RESULT_CACHE_SIZE:
+        _results.popitem(last=False)
+
+
+def _finish_inflight(key: tuple[Platform, str], task: asyncio.Task[str]) -> None:
+    """Drop a finished call from the in-flight map, caching its result."""
+    _inflight.pop(key, None)
+    if not task.cancelled():
+        # Failures are logged by _call_groq; mark the exception as retrieved
+        # in case every caller has already gone away
+        if task.exception() is None:
+            _cache_post(_result_key(*key), task.result())
+
 
 # Platform-specific prompt templates
 TWITTER_PROMPT_TEMPLATE = """You are an expert social media manager with decades of experience and expertise. You excel at crafting and optimizing social media content for maximum engagement and impact for X (X.com => formerly Twitter).
@@ -55,10 +221,28 @@ Guidelines:
 Topic: {topic}"""
 
 
+# Templates split once at import time around the {topic} placeholder, so
+# building a prompt is plain string concatenation instead of str.format
+_TWITTER_PREFIX, _TWITTER_SUFFIX = TWITTER_PROMPT_TEMPLATE.split("{topic}")
+_LINKEDIN_PREFIX, _LINKEDIN_SUFFIX = LINKEDIN_PROMPT_TEMPLATE.split("{topic}")
+
+_PROMPT_PARTS = {
+    Platform.TWITTER: (_TWITTER_PREFIX, _TWITTER_SUFFIX),
+    Platform.LINKEDIN: (_LINKEDIN_PREFIX, _LINKEDIN_SUFFIX),
+}
+
+# Translation table for escaping angle brackets in a single pass
+_HTML_ESCAPE_TABLE = str.maketrans({"<": "&lt;", ">": "&gt;"})
+
+
+@lru_cache(maxsize=1024)
 def get_platform_prompt(platform: Platform, topic: str) -> str:
     """
     Get platform-specific prompt for content generation.
 
+    Results are memoized in a bounded LRU cache, since the same
+    (platform, topic) pairs tend to be requested repeatedly.
+
     Args:
         platform: The target social media platform
         topic: The topic for the post
@@ -66,15 +250,22 @@ def get_platform_prompt(platform: Platform, topic: str) -> str:
     Returns:
         Platform-optimized prompt string
     """
-    if platform == Platform.TWITTER:
-        return TWITTER_PROMPT_TEMPLATE.format(topic=topic)
+    # Default to Twitter format for unknown platforms
+    prefix, suffix = _PROMPT_PARTS.get(platform, _PROMPT_PARTS[Platform.TWITTER])
+    return prefix + topic + suffix
 
-    elif platform == Platform.LINKEDIN:
-        return LINKEDIN_PROMPT_TEMPLATE.format(topic=topic)
 
-    else:
-        # Default to Twitter format for unknown platforms
-        return get_platform_prompt(Platform.TWITTER, topic)
+def sanitize_topic(topic: str) -> str:
+    """
+    Sanitize a topic to prevent prompt injection.
+
+    Args:
+        topic: An already stripped, non-empty topic
+
+    Returns:
+        The topic with angle brackets escaped
+    """
+    return topic.translate(_HTML_ESCAPE_TABLE)
 
 
 async def generate_social_post(
@@ -95,62 +286,265 @@ async def generate_social_post(
         Exception: If API call fails
     """
     # Validate input
-    if not usr_topic or not usr_topic.strip():
+    topic = usr_topic.strip() if usr_topic else ""
+    if not topic:
         raise ValueError("Topic cannot be empty")
 
-    # Sanitize topic to prevent prompt injection
-    sanitized_topic = usr_topic.replace("<", "&lt;").replace(">", "&gt;").strip()
+    return await generate_post_from_sanitized(sanitize_topic(topic), platform)
+
+
+async def generate_post_from_sanitized(
+    sanitized_topic: str, platform: Platform = Platform.TWITTER, use_cache: bool = True
+) -> str:
+    """
+    Generate a social media post for a topic that is already validated and sanitized.
+
+    Route handlers validate topics before calling this, so it skips the
+    stripping and emptiness checks done by generate_social_post. Recently
+    generated posts are served from an in-process LRU cache, and concurrent
+    calls for the same platform and topic are coalesced into one API request.
+
+    Args:
+        sanitized_topic: Topic as returned by sanitize_topic
+        platform: The target social media platform
+        use_cache: Whether a cached or in-flight post may be reused; when
+            False a fresh post is always generated (and then cached)
+
+    Returns:
+        Generated social media post text
+
+    Raises:
+        Exception: If API call fails
+    """
+    if not use_cache:
+        post = await _call_groq(get_platform_prompt(platform, sanitized_topic))
+        _cache_post(_result_key(platform, sanitized_topic), post)
+        return post
+
+    post = _get_cached_post(_result_key(platform, sanitized_topic))
+    if post is not None:
+        logger.debug("Using cached post for topic: %s...", sanitized_topic[:50])
+        return post
+
+    key = (platform, sanitized_topic)
+    task = _inflight.get(key)
+    if task is None:
+        logger.debug("Making API request for topic: %s...", sanitized_topic[:50])
+        task = asyncio.create_task(
+            _call_groq(get_platform_prompt(platform, sanitized_topic))
+        )
+        _inflight[key] = task
+        task.add_done_callback(partial(_finish_inflight, key))
+    else:
+        logger.debug(
+            "Joining in-flight API request for topic: %s...", sanitized_topic[:50]
+        )
+
+    # Shield the shared call so one caller disconnecting doesn't cancel it for all
+    return await asyncio.shield(task)
+
+
+async def stream_post_from_sanitized(
+    sanitized_topic: str, platform: Platform = Platform.TWITTER, use_cache: bool = True
+) -> AsyncIterator[str]:
+    """
+    Stream a social media post for an already validated and sanitized topic.
+
+    Requests a streamed completion from the Groq API and yields the text as
+    it is generated, so callers can forward it before the post is finished.
+    Leading whitespace of the post is dropped. A cached post, or the result
+    of an identical generate_post_from_sanitized call already in flight, is
+    yielded as a single chunk instead; a completed stream is cached.
+
+    Args:
+        sanitized_topic: Topic as returned by sanitize_topic
+        platform: The target social media platform
+        use_cache: Whether a cached or in-flight post may be reused
+
+    Yields:
+        Successive chunks of the generated post text
+
+    Raises:
+        Exception: If API call fails or returns no content
+    """
+    result_key = _result_key(platform, sanitized_topic)
+    if use_cache:
+        post = _get_cached_post(result_key)
+        if post is not None:
+            logger.debug("Using cached post for topic: %s...", sanitized_topic[:50])
+            yield post
+            return
+
+        task = _inflight.get((platform, sanitized_topic))
+        if task is not None:
+            logger.debug(
+                "Joining in-flight API request for topic: %s...", sanitized_topic[:50]
+            )
+            yield await asyncio.shield(task)
+            return
 
-    # Get platform-specific prompt
     prompt = get_platform_prompt(platform, sanitized_topic)
+    payload = _STREAM_PAYLOAD_PREFIX + orjson.dumps(prompt) + _STREAM_PAYLOAD_SUFFIX
+
+    try:
+        client = await get_client()
+        async with _limiter:
+            started = time.monotonic()
+            try:
+                async with client.stream(
+                    "POST", GROQ_API_URL, headers=_HEADERS, content=payload
+                ) as response:
+                    _limiter.record(started, overloaded=_check_backpressure(response))
+                    if response.status_code != 200:
+                        await response.aread()
+                        error_msg = (
+                            f"Groq API error: {response.status_code} - "
+                            f"{response.text[:_ERROR_BODY_LIMIT]}"
+                        )
+                        logger.error(error_msg)
+                        raise Exception(error_msg)
+
+                    parts: list[str] = []
+                    async for line in response.aiter_lines():
+                        if not line.startswith(_SSE_DATA_PREFIX):
+                            continue
+                        data = line[len(_SSE_DATA_PREFIX) :]
+                        if data == _SSE_DONE:
+                            break
+                        choices = orjson.loads(data).get("choices")
+                        content = (
+                            choices[0]["delta"].get("content") if choices else None
+                        )
+                        if not parts and content:
+                            content = content.lstrip()
+                        if content:
+                            parts.append(content)
+                            yield content
+            except httpx.TimeoutException:
+                _limiter.record(started, overloaded=True)
+                raise
+
+        if not parts:
+            logger.warning("API returned empty content")
+            raise Exception("API returned empty content")
+        _cache_post(result_key, "".join(parts).rstrip())
+
+    except httpx.TimeoutException:
+        error_msg = "Request timed out. Please try again."
+        logger.error(error_msg)
+        raise Exception(error_msg)
+    except httpx.RequestError as e:
+        error_msg = f"Network error: {str(e)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+    except (KeyError, IndexError, orjson.JSONDecodeError) as e:
+        error_msg = f"Unexpected API response format: {str(e)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+
+
+def _parse_duration(value: str) -> float:
+    """Parse a Groq rate limit reset duration such as "1m2.5s" into seconds."""
+    return sum(
+        float(amount) * _DURATION_UNITS[unit]
+        for amount, unit in _DURATION_RE.findall(value)
+    )
+
+
+def _check_backpressure(response: httpx.Response) -> bool:
+    """
+    Check a Groq API response for signs of upstream overload.
 
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json",
-    }
+    A Retry-After header pauses new calls for the given number of seconds.
+    So does a nearly spent per-minute token budget, until it resets. Pauses
+    are capped at REQUEST_TIMEOUT.
 
-    payload = {
-        "model": MODEL,
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": 300,
-        "temperature": 0.7,
-    }
+    Args:
+        response: Response from the Groq API
+
+    Returns:
+        True if the call was rate limited or failed server-side
+    """
+    headers = response.headers
+    try:
+        retry_after = float(headers.get("retry-after", 0))
+    except ValueError:
+        retry_after = 0.0
+    if retry_after > 0:
+        _limiter.pause(min(retry_after, REQUEST_TIMEOUT))
+
+    # The token headers describe a per-minute budget; the request-count
+    # headers describe the daily quota, which concurrency can't protect
+    try:
+        remaining = int(headers["x-ratelimit-remaining-tokens"])
+        budget = int(headers["x-ratelimit-limit-tokens"])
+        reset = _parse_duration(headers["x-ratelimit-reset-tokens"])
+    except (KeyError, ValueError):
+        pass
+    else:
+        if remaining < budget * _TOKEN_HEADROOM and reset > 0:
+            _limiter.pause(min(reset, REQUEST_TIMEOUT))
+
+    return response.status_code == 429 or response.status_code >= 500
+
+
+async def _call_groq(prompt: str) -> str:
+    """
+    Send a prompt to the Groq chat completions API.
+
+    Args:
+        prompt: The full prompt to send
+
+    Returns:
+        Generated text, stripped of surrounding whitespace
+
+    Raises:
+        Exception: If API call fails or returns no usable content
+    """
+    # Only the prompt needs encoding; the rest of the payload is pre-encoded
+    payload = _PAYLOAD_PREFIX + orjson.dumps(prompt) + _PAYLOAD_SUFFIX
 
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            logger.debug(f"Making API request for topic: {usr_topic[:50]}...")
-            logger.debug(f"API URL: {GROQ_API_URL}")
-            logger.debug(f"Payload: {payload}")
-            response = await client.post(GROQ_API_URL, headers=headers, json=payload)
-
-            if response.status_code == 200:
-                response_data = response.json()
-                logger.debug(f"Full API response: {response_data}")
-
-                # Check if we have choices in the response
-                if "choices" not in response_data or not response_data["choices"]:
-                    logger.error(f"No choices in API response: {response_data}")
-                    raise Exception("No choices returned from API")
-
-                # Extract the generated text
-                choice = response_data["choices"][0]
-                if "message" not in choice or "content" not in choice["message"]:
-                    logger.error(f"Invalid choice structure: {choice}")
-                    raise Exception("Invalid response structure from API")
-
-                generated_text = choice["message"]["content"]
-                logger.debug(f"Generated text: '{generated_text}'")
-
-                if not generated_text or not generated_text.strip():
-                    logger.warning("API returned empty content")
-                    raise Exception("API returned empty content")
-
-                logger.debug("API request successful")
-                return generated_text.strip()
-            else:
-                error_msg = f"Groq API error: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
+        client = await get_client()
+        logger.debug("API URL: %s", GROQ_API_URL)
+        logger.debug("Payload: %s", payload)
+        async with _limiter:
+            started = time.monotonic()
+            try:
+                response = await client.post(
+                    GROQ_API_URL, headers=_HEADERS, content=payload
+                )
+            except httpx.TimeoutException:
+                _limiter.record(started, overloaded=True)
+                raise
+            _limiter.record(started, overloaded=_check_backpressure(response))
+
+        if response.status_code == 200:
+            response_data = orjson.loads(response.content)
+            logger.debug("Full API response: %s", response_data)
+
+            # Extract the generated text in one lookup chain
+            try:
+                generated_text = response_data["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                logger.error("Invalid API response structure: %s", response_data)
+                raise Exception("Invalid response structure from API")
+
+            logger.debug("Generated text: '%s'", generated_text)
+
+            if not generated_text or not generated_text.strip():
+                logger.warning("API returned empty content")
+                raise Exception("API returned empty content")
+
+            logger.debug("API request successful")
+            return generated_text.strip()
+        else:
+            error_msg = (
+                f"Groq API error: {response.status_code} - "
+                f"{response.text[:_ERROR_BODY_LIMIT]}"
+            )
+            logger.error(error_msg)
+            raise Exception(error_msg)
 
     except httpx.TimeoutException:
         error_msg = "Request timed out. Please try again."
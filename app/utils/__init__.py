@@ -2,9 +2,22 @@
 Utility functions and helpers.
 """
 
-from .rate_limiter import check_rate_limit, get_client_ip
+from .concurrency import AdaptiveConcurrencyLimiter
+from .rate_limiter import (
+    check_local_rate_limit,
+    check_rate_limit,
+    close_rate_limiter,
+    get_client_ip,
+    init_rate_limiter,
+)
+from .static_files import CachedStaticFiles
 
 __all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "CachedStaticFiles",
+    "check_local_rate_limit",
     "check_rate_limit",
+    "close_rate_limiter",
     "get_client_ip",
+    "init_rate_limiter",
 ]
@@ -0,0 +1,101 @@
+"""
+Adaptive concurrency limiting utilities.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit that adapts to upstream backpressure (AIMD).
+
+    Works like TCP congestion control: every healthy call raises the limit by
+    increase / limit, so it grows by roughly `increase` per limit's worth of
+    calls, while an overloaded call (rate limited, server error, timeout, or
+    mean latency over the target) multiplies it by `decrease`. Calls that
+    started before the last decrease are ignored so one burst of failures only
+    cuts the limit once.
+
+    Usage:
+        async with limiter:
+            started = time.monotonic()
+            ...
+            limiter.record(started, overloaded=...)
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int | None = None,
+        latency_target: float = 5.0,
+        latency_window: int = 20,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum or initial
+        self.latency_target = latency_target
+        self.increase = increase
+        self.decrease = decrease
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._decreased_at = 0.0
+        self._resume_at = 0.0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        return int(self._limit)
+
+    async def __aenter__(self) -> None:
+        # Wait out any pause requested by the upstream before taking a slot
+        while (delay := self._resume_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            # Admit as many waiters as there are free slots; more than one
+            # when the limit was raised during this call
+            self._condition.notify(max(1, self.limit - self._in_flight))
+
+    def record(self, started: float, overloaded: bool = False) -> None:
+        """
+        Adjust the limit from the outcome of one call.
+
+        Args:
+            started: time.monotonic() value taken when the call was sent
+            overloaded: Whether the upstream signalled overload
+        """
+        if started < self._decreased_at:
+            return
+
+        now = time.monotonic()
+        self._latencies.append(now - started)
+        if not overloaded and len(self._latencies) == self._latencies.maxlen:
+            mean_latency = sum(self._latencies) / len(self._latencies)
+            overloaded = mean_latency > self.latency_target
+
+        if overloaded:
+            self._limit = max(self.minimum, self._limit * self.decrease)
+            self._decreased_at = now
+            self._latencies.clear()
+        else:
+            self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back new calls for a while, e.g. to honour a Retry-After header.
+
+        Args:
+            seconds: How long to wait before sending the next call
+        """
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
@@ -2,42 +2,200 @@
 Rate limiting utilities.
 """
 
+import ipaddress
+import logging
 import time
-from collections import defaultdict
+import uuid
+from collections import OrderedDict
 from fastapi import Request
 
-from ..config.settings import RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW
+from ..config.settings import (
+    RATE_LIMIT_MAX_TRACKED_IPS,
+    RATE_LIMIT_REQUESTS,
+    RATE_LIMIT_SWEEP_BATCH,
+    RATE_LIMIT_WINDOW,
+    REDIS_URL,
+    TRUSTED_PROXIES,
+)
 
-# Rate limiting (simple in-memory store - use Redis in production)
-request_counts: dict[str, list[float]] = defaultdict(list)
+logger = logging.getLogger(__name__)
 
+# Token bucket refill rate (tokens per second)
+REFILL_RATE = RATE_LIMIT_REQUESTS / RATE_LIMIT_WINDOW
 
-def check_rate_limit(client_ip: str) -> bool:
+# Networks whose X-Forwarded-For header is trusted
+TRUSTED_PROXY_NETWORKS = [
+    ipaddress.ip_network(proxy, strict=False) for proxy in TRUSTED_PROXIES
+]
+
+# In-memory store, used when REDIS_URL is not set or Redis is unreachable.
+# Maps client IP -> (available tokens, last refill timestamp), kept in
+# least-recently-seen order so the store stays bounded
+buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+# Sliding window log in a Redis sorted set, applied atomically: drop entries
+# older than the window, then record the request only if under the limit
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call("ZREMRANGEBYSCORE", key, 0, now - window)
+if redis.call("ZCARD", key) < limit then
+    redis.call("ZADD", key, now, ARGV[4])
+    redis.call("EXPIRE", key, window)
+    return 1
+end
+return 0
+"""
+
+# Seconds to keep using the in-memory store after a Redis error
+REDIS_RETRY_INTERVAL = 30.0
+
+# Seconds to wait on Redis for a connection or a reply before falling back, so
+# an unreachable host can't stall every request until the OS TCP timeout
+REDIS_SOCKET_TIMEOUT = 0.5
+
+_redis = None
+_sliding_window = None
+_redis_errors: tuple[type[Exception], ...] = (OSError, ValueError)
+_redis_retry_at = 0.0
+
+
+async def init_rate_limiter() -> None:
     """
-    Simple rate limiting check.
-    In production, use Redis or a proper rate limiting service.
+    Create the Redis client for shared rate limiting, if REDIS_URL is set.
+
+    Called on startup, so a missing "redis" extra or a malformed REDIS_URL
+    stops the app from starting instead of failing every request. The
+    connection itself is opened lazily; an unreachable server only makes
+    requests fall back to the in-memory limiter.
+
+    Raises:
+        RuntimeError: If the redis package is missing or REDIS_URL is invalid
     """
-    current_time = time.time()
+    global _redis, _sliding_window, _redis_errors
+    if not REDIS_URL or _redis is not None:
+        return
 
-    # Clean old requests
-    request_counts[client_ip] = [
-        req_time
-        for req_time in request_counts[client_ip]
-        if current_time - req_time < RATE_LIMIT_WINDOW
-    ]
+    try:
+        from redis.asyncio import Redis
+        from redis.exceptions import RedisError
+    except ImportError as e:
+        raise RuntimeError(
+            'REDIS_URL is set but the "redis" extra is not installed'
+        ) from e
 
-    # Check if limit exceeded
-    if len(request_counts[client_ip]) >= RATE_LIMIT_REQUESTS:
-        return False
+    try:
+        _redis = Redis.from_url(
+            REDIS_URL,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+        )
+    except ValueError as e:
+        raise RuntimeError(f"Invalid REDIS_URL: {e}") from e
+    _sliding_window = _redis.register_script(SLIDING_WINDOW_SCRIPT)
+    _redis_errors = (RedisError, OSError, ValueError)
+
+
+async def close_rate_limiter() -> None:
+    """Close the Redis connection pool, if one was opened."""
+    global _redis, _sliding_window
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+        _sliding_window = None
+
+
+async def check_rate_limit(client_ip: str) -> bool:
+    """
+    Rate limiting check.
+
+    With REDIS_URL configured (and init_rate_limiter called), limits are
+    shared across all workers using a sliding window in Redis. Without it, or
+    while Redis is unreachable, each worker falls back to its own in-memory
+    token bucket.
+    """
+    global _redis_retry_at
+    if _sliding_window is not None and time.monotonic() >= _redis_retry_at:
+        try:
+            allowed = await _sliding_window(
+                keys=[f"rate_limit:{client_ip}"],
+                args=[
+                    time.time(),
+                    RATE_LIMIT_WINDOW,
+                    RATE_LIMIT_REQUESTS,
+                    uuid.uuid4().hex,
+                ],
+            )
+            return bool(allowed)
+        except _redis_errors as e:
+            logger.warning("Redis rate limiting unavailable, using in-memory: %s", e)
+            _redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    return check_local_rate_limit(client_ip)
+
+
+def check_local_rate_limit(client_ip: str) -> bool:
+    """
+    Token bucket rate limiting check, local to this process.
+
+    Each client starts with a full bucket of RATE_LIMIT_REQUESTS tokens which
+    refills continuously over RATE_LIMIT_WINDOW seconds. Every request consumes
+    one token, so each check is O(1) regardless of traffic volume.
+    Buckets idle for a full window have refilled completely, so they are
+    evicted a small batch at a time; at most RATE_LIMIT_MAX_TRACKED_IPS
+    buckets are kept even under a flood of distinct IPs.
+    """
+    now = time.monotonic()
+    tokens, last_refill = buckets.get(client_ip, (RATE_LIMIT_REQUESTS, now))
+
+    # Refill tokens based on time elapsed since the last request
+    tokens = min(RATE_LIMIT_REQUESTS, tokens + (now - last_refill) * REFILL_RATE)
+
+    # Consume a token for the current request unless the limit is exceeded
+    allowed = tokens >= 1
+    buckets[client_ip] = (tokens - 1 if allowed else tokens, now)
 
-    # Add current request
-    request_counts[client_ip].append(current_time)
-    return True
+    # Mark as most recently seen, then evict idle buckets from the oldest end;
+    # a bucket untouched for a whole window is the same as a fresh one
+    buckets.move_to_end(client_ip)
+    idle_before = now - RATE_LIMIT_WINDOW
+    for _ in range(RATE_LIMIT_SWEEP_BATCH):
+        oldest_ip, (_, last_seen) = next(iter(buckets.items()))
+        if last_seen >= idle_before:
+            break
+        del buckets[oldest_ip]
+
+    # Evict the least recently seen entry when still over capacity
+    if len(buckets) > RATE_LIMIT_MAX_TRACKED_IPS:
+        buckets.popitem(last=False)
+
+    return allowed
+
+
+def is_trusted_proxy(host: str) -> bool:
+    """Check whether a peer address belongs to a trusted reverse proxy."""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXY_NETWORKS)
 
 
 def get_client_ip(request: Request) -> str:
-    """Get client IP address from request."""
+    """
+    Get client IP address from request.
+
+    X-Forwarded-For is only honoured when the direct peer is a trusted proxy,
+    since any client can set the header. The client is then the right-most
+    address in the chain that is not itself a trusted proxy.
+    """
+    host = request.client.host if request.client else "unknown"
     forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
+    if forwarded and is_trusted_proxy(host):
+        for address in reversed(forwarded.split(",")):
+            host = address.strip()
+            if not is_trusted_proxy(host):
+                break
+    return host
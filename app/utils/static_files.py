@@ -0,0 +1,35 @@
+"""
+Static file serving utilities.
+"""
+
+import os
+
+from starlette.responses import Response
+from starlette.staticfiles import PathLike, StaticFiles
+from starlette.types import Scope
+
+from ..config.settings import STATIC_CACHE_MAX_AGE
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that lets browsers cache assets.
+
+    Adds a Cache-Control header so repeat page loads reuse cached CSS and
+    other assets instead of requesting them again. Asset names carry no
+    content hash, so the lifetime is bounded by STATIC_CACHE_MAX_AGE rather
+    than marked immutable; ETag/Last-Modified revalidation still applies.
+    """
+
+    cache_control = f"public, max-age={STATIC_CACHE_MAX_AGE}"
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
@@ -4,6 +4,9 @@ Entry point for the FastAPI Social Media Post Generator application.
 This module imports and exposes the FastAPI app instance for uvicorn to run.
 """
 
+import os
+import sys
+
 from app.main import app
 
 # Export the app instance for uvicorn
@@ -11,4 +14,16 @@ __all__ = ["app"]
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # One worker per CPU on uvloop + httptools. uvloop is unavailable on
+    # Windows, where uvicorn's "auto" choice falls back to asyncio. Rate
+    # limits are per worker unless REDIS_URL is set.
+    uvicorn.run(
+        "run:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=os.cpu_count(),
+        loop="auto" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        log_level="warning",
+    )
@@ -1,3 +1,8 @@
 """
 Test package for the FastAPI application.
 """
+
+import os
+
+# Settings require an API key at import time; unit tests never call Groq
+os.environ.setdefault("GROQ_API_KEY", "test-key")
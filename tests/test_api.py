@@ -62,6 +62,28 @@ async def test_api_generate_post_platforms():
         return True
 
 
+async def test_api_generate_post_stream():
+    """Test the streaming API post generation endpoint."""
+    async with httpx.AsyncClient() as client:
+        payload = {"topic": "The benefits of morning exercise"}
+        async with client.stream(
+            "POST", "http://localhost:8000/api/generate-post/stream", json=payload
+        ) as response:
+            print(f"API Generate Post (stream): {response.status_code}")
+            if response.status_code != 200:
+                print(f"Error: {(await response.aread()).decode()}")
+                return False
+
+            chunks = 0
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    print(f"Final event: {line[7:]}")
+                elif line.startswith("data: "):
+                    chunks += 1
+            print(f"Events received: {chunks}")
+        return True
+
+
 async def test_rate_limiting():
     """Test rate limiting by making multiple requests."""
     async with httpx.AsyncClient() as client:
@@ -104,8 +126,16 @@ async def main():
         print(f"Expected error (no Groq API key): {e}")
     print()
 
+    # Test streaming API generation
+    print("4. Testing streaming API generation...")
+    try:
+        await test_api_generate_post_stream()
+    except Exception as e:
+        print(f"Expected error (no Groq API key): {e}")
+    print()
+
     # Test rate limiting
-    print("4. Testing rate limiting...")
+    print("5. Testing rate limiting...")
     try:
         await test_rate_limiting()
     except Exception as e:
@@ -0,0 +1,127 @@
+"""
+Unit tests for the adaptive concurrency limiter.
+
+Run from the project root with: python -m unittest discover -s tests -t .
+"""
+
+import asyncio
+import time
+import unittest
+
+from app.utils.concurrency import AdaptiveConcurrencyLimiter
+
+# Upper bound for async tests, so a deadlocked limiter fails instead of hanging
+TIMEOUT = 1.0
+
+
+class AdaptiveConcurrencyLimiterTest(unittest.IsolatedAsyncioTestCase):
+    """AIMD limit adjustments and slot handling."""
+
+    def test_overload_halves_limit_once_per_burst(self):
+        limiter = AdaptiveConcurrencyLimiter(8)
+        started = time.monotonic()
+
+        limiter.record(started, overloaded=True)
+        self.assertEqual(limiter.limit, 4)
+
+        # Calls sent before the cut don't cut the limit again
+        limiter.record(started, overloaded=True)
+        limiter.record(started, overloaded=True)
+        self.assertEqual(limiter.limit, 4)
+
+        # A call sent after the cut does
+        limiter.record(time.monotonic(), overloaded=True)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_limit_stays_within_bounds(self):
+        limiter = AdaptiveConcurrencyLimiter(4, minimum=2)
+        for _ in range(5):
+            limiter.record(time.monotonic(), overloaded=True)
+        self.assertEqual(limiter.limit, 2)
+
+        for _ in range(50):
+            limiter.record(time.monotonic())
+        self.assertEqual(limiter.limit, 4)
+
+    def test_healthy_calls_recover_limit_additively(self):
+        limiter = AdaptiveConcurrencyLimiter(8)
+        limiter.record(time.monotonic(), overloaded=True)
+        self.assertEqual(limiter.limit, 4)
+
+        # About one step per limit's worth of healthy calls
+        for _ in range(4):
+            limiter.record(time.monotonic())
+        self.assertEqual(limiter.limit, 4)
+        limiter.record(time.monotonic())
+        self.assertEqual(limiter.limit, 5)
+
+    def test_slow_calls_count_as_overload(self):
+        limiter = AdaptiveConcurrencyLimiter(8, latency_target=1.0, latency_window=2)
+        slow_start = time.monotonic() - 5.0
+
+        limiter.record(slow_start)
+        self.assertEqual(limiter.limit, 8)  # window not full yet
+        limiter.record(slow_start)
+        self.assertEqual(limiter.limit, 4)
+
+    async def test_limits_calls_in_flight(self):
+        limiter = AdaptiveConcurrencyLimiter(2)
+        running = peak = 0
+
+        async def call():
+            nonlocal running, peak
+            async with limiter:
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0)
+                running -= 1
+
+        async with asyncio.timeout(TIMEOUT):
+            await asyncio.gather(*(call() for _ in range(10)))
+        self.assertEqual(peak, 2)
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter:
+                await release.wait()
+
+        async def waiter():
+            async with limiter:
+                pass
+
+        holding = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+
+        release.set()
+        # The only slot is free again
+        async with asyncio.timeout(TIMEOUT):
+            await holding
+            async with limiter:
+                pass
+
+    async def test_pause_delays_new_calls(self):
+        limiter = AdaptiveConcurrencyLimiter(4)
+        limiter.pause(0.05)
+
+        started = time.monotonic()
+        async with asyncio.timeout(TIMEOUT):
+            async with limiter:
+                pass
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+        # Shorter pauses never shorten a longer one
+        limiter.pause(0.2)
+        limiter.pause(0.01)
+        self.assertGreater(limiter._resume_at - time.monotonic(), 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Unit tests for client IP resolution and the in-memory rate limiter.
+
+Run from the project root with: python -m unittest discover -s tests -t .
+"""
+
+import ipaddress
+import time
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+from starlette.requests import Request
+
+from app.utils import rate_limiter
+
+TRUSTED = [
+    ipaddress.ip_network("10.0.0.0/8"),
+    ipaddress.ip_network("192.0.2.1"),
+]
+
+
+def make_request(peer: str | None, forwarded: str | None = None) -> Request:
+    """Build a bare request from a peer address and X-Forwarded-For value."""
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    client = (peer, 12345) if peer else None
+    return Request({"type": "http", "headers": headers, "client": client})
+
+
+@mock.patch.object(rate_limiter, "TRUSTED_PROXY_NETWORKS", TRUSTED)
+class GetClientIpTest(unittest.TestCase):
+    """X-Forwarded-For is only honoured from trusted proxies."""
+
+    def test_is_trusted_proxy(self):
+        self.assertTrue(rate_limiter.is_trusted_proxy("10.1.2.3"))
+        self.assertTrue(rate_limiter.is_trusted_proxy("192.0.2.1"))
+        self.assertFalse(rate_limiter.is_trusted_proxy("192.0.2.2"))
+        self.assertFalse(rate_limiter.is_trusted_proxy("testclient"))
+
+    def test_untrusted_peer_ignores_forwarded_header(self):
+        request = make_request("203.0.113.7", "198.51.100.1")
+        self.assertEqual(rate_limiter.get_client_ip(request), "203.0.113.7")
+
+    def test_no_trusted_proxies_configured(self):
+        request = make_request("10.0.0.5", "198.51.100.1")
+        with mock.patch.object(rate_limiter, "TRUSTED_PROXY_NETWORKS", []):
+            self.assertEqual(rate_limiter.get_client_ip(request), "10.0.0.5")
+
+    def test_trusted_peer_uses_forwarded_client(self):
+        request = make_request("10.0.0.5", "198.51.100.1")
+        self.assertEqual(rate_limiter.get_client_ip(request), "198.51.100.1")
+
+    def test_trusted_chain_resolves_right_most_untrusted_address(self):
+        # The left-most entries are client-supplied and can be spoofed
+        request = make_request(
+            "10.0.0.5", "1.1.1.1, 198.51.100.1, 192.0.2.1 , 10.9.9.9"
+        )
+        self.assertEqual(rate_limiter.get_client_ip(request), "198.51.100.1")
+
+    def test_chain_of_only_trusted_proxies(self):
+        request = make_request("10.0.0.5", "10.0.0.1, 10.0.0.2")
+        self.assertEqual(rate_limiter.get_client_ip(request), "10.0.0.1")
+
+    def test_missing_client(self):
+        self.assertEqual(rate_limiter.get_client_ip(make_request(None)), "unknown")
+
+
+class LocalRateLimitTest(unittest.TestCase):
+    """Token bucket limiting and idle bucket eviction."""
+
+    def setUp(self):
+        patcher = mock.patch.object(rate_limiter, "buckets", OrderedDict())
+        self.buckets = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_limits_after_burst(self):
+        results = [
+            rate_limiter.check_local_rate_limit("198.51.100.1")
+            for _ in range(rate_limiter.RATE_LIMIT_REQUESTS + 1)
+        ]
+        self.assertTrue(all(results[:-1]))
+        self.assertFalse(results[-1])
+
+    def test_idle_buckets_are_swept(self):
+        idle_since = time.monotonic() - rate_limiter.RATE_LIMIT_WINDOW - 1
+        for i in range(rate_limiter.RATE_LIMIT_SWEEP_BATCH):
+            self.buckets[f"idle-{i}"] = (0.0, idle_since)
+        self.buckets["active"] = (5.0, time.monotonic())
+
+        rate_limiter.check_local_rate_limit("new")
+        self.assertEqual(list(self.buckets), ["active", "new"])
+
+
+if __name__ == "__main__":
+    unittest.main()